@@ -1,209 +1,435 @@
-import requests
-from bs4 import BeautifulSoup
+import numpy as np
+from numba import njit, types
+import requests_cache
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import csv
 import itertools
-from collections import Counter, defaultdict
-from datetime import datetime
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from plots import (
+    combination_table,
+    frequency_table,
+    init_plot_worker,
+    plot_combinations,
+    plot_frequency,
+    plot_odd_even,
+    plot_yearly_heatmap,
+)
+
+
+MONTHS = {
+    "January": 1,
+    "February": 2,
+    "March": 3,
+    "April": 4,
+    "May": 5,
+    "June": 6,
+    "July": 7,
+    "August": 8,
+    "September": 9,
+    "October": 10,
+    "November": 11,
+    "December": 12,
+}
+
+WEEKDAYS = {
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+}
+
+DRAW_ENTRY_STRAINER = SoupStrainer("div", class_="section group")
+
+
+def parse_draw_date(date_text):
+    # Parses "%A, %B %d, %Y" like datetime.strptime: names in any case, any
+    # run of whitespace between fields, a 1-2 digit day and a 4-digit year.
+    normalized = " ".join(date_text.split()).title()
+    try:
+        weekday, month_day, year = normalized.split(", ")
+        month, day = month_day.split(" ")
+        month = MONTHS[month]
+    except (ValueError, KeyError):
+        raise ValueError(f"Unrecognized draw date: {date_text!r}") from None
+
+    if (
+        weekday not in WEEKDAYS
+        or not (day.isdigit() and len(day) <= 2)
+        or not (year.isdigit() and len(year) == 4)
+    ):
+        raise ValueError(f"Unrecognized draw date: {date_text!r}")
+
+    return datetime(int(year), month, int(day))
 
 
 def parse_html_data(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    draws = []
-
-    draw_entries = soup.find_all("div", class_="section group")
-
-    for entry in draw_entries:
-        if not entry.find("div", class_="col s_3_12"):
+    soup = BeautifulSoup(html_content, "lxml", parse_only=DRAW_ENTRY_STRAINER)
+    dates = []
+    years = []
+    numbers = []
+
+    for entry in soup.contents:
+        date_col = entry.select_one("div.col.s_3_12")
+        if date_col is None:
             continue
-
-        date_col = entry.find("div", class_="col s_3_12")
         date_text = date_col.get_text(strip=True)
 
-        numbers_col = entry.find("div", class_="col s_9_12")
-        if not numbers_col:
+        numbers_col = entry.select_one("div.col.s_9_12")
+        if numbers_col is None:
             continue
 
-        white_balls = []
-        for ball in numbers_col.find_all("span", class_="white ball"):
-            num = ball.get_text(strip=True)
-            if num.isdigit():
-                white_balls.append(int(num))
+        white_balls = [
+            int(num)
+            for num in (
+                ball.get_text(strip=True)
+                for ball in numbers_col.select("span.white.ball")
+            )
+            if num.isdigit()
+        ]
 
         try:
-            date_obj = datetime.strptime(date_text, "%A, %B %d, %Y")
+            date_obj = parse_draw_date(date_text)
             date_str = date_obj.strftime("%Y-%m-%d")
             year = date_obj.year
         except ValueError:
             continue
 
-        draws.append({"date": date_str, "numbers": white_balls, "year": year})
+        if len(white_balls) != 7:
+            continue
+        if not all(1 <= n <= 50 for n in white_balls):
+            continue
+
+        dates.append(date_str)
+        years.append(year)
+        numbers.append(white_balls)
 
-    return draws
+    return make_draws(numbers, years, dates)
 
 
-def fetch_historical_data(start_year=2009, end_year=2025):
-    all_draws = []
-    base_url = "https://www.lottodatabase.com/lotto-database/canadian-lotteries/lotto-max/draw-history/"
+ODD_MASK = np.uint64(sum(1 << num for num in range(1, 51, 2)))
+HIGH_MASK = np.uint64(sum(1 << num for num in range(26, 51)))
 
-    for year in range(start_year, end_year + 1):
-        url = f"{base_url}{year}"
-        print(f"Fetching data for year {year}...")
 
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                year_draws = parse_html_data(response.text)
-                all_draws.extend(year_draws)
-                print(f"  Found {len(year_draws)} draws for {year}")
-            else:
-                print(f"  Failed to fetch data for {year}: HTTP {response.status_code}")
-        except Exception as e:
-            print(f"  Error fetching data for {year}: {e}")
+if hasattr(np, "bitwise_count"):
+    popcount = np.bitwise_count
+else:
+    # np.bitwise_count is NumPy 2.0+.
+    def popcount(values):
+        bits = np.unpackbits(np.ascontiguousarray(values).view(np.uint8))
+        return bits.reshape(-1, 64).sum(axis=1)
+
+
+def draw_masks(numbers):
+    bits = np.left_shift(np.uint64(1), numbers.astype(np.uint64))
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def make_draws(numbers, years, dates):
+    numbers = np.asarray(numbers, dtype=np.uint8).reshape(-1, 7)
+    numbers.sort(axis=1)
+
+    return {
+        "numbers": numbers,
+        "masks": draw_masks(numbers),
+        "years": np.asarray(years, dtype=np.int16),
+        "dates": np.asarray(dates, dtype="datetime64[D]"),
+    }
+
+
+def concat_draws(parts):
+    if not parts:
+        return make_draws([], [], [])
+
+    return {
+        key: np.concatenate([part[key] for part in parts])
+        for key in ("numbers", "masks", "years", "dates")
+    }
+
+
+class RateLimiter:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            if self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time = max(now, self.next_time) + self.delay
+
 
-    return all_draws
+class RateLimitedAdapter(HTTPAdapter):
+    # CachedSession only reaches the adapter on a cache miss, so cached pages
+    # are returned without waiting.
+    def __init__(self, rate_limiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.wait()
+        return super().send(request, **kwargs)
+
+
+def make_session(
+    cache_name="lotto_cache", expire_after=timedelta(days=30), delay=0.2
+):
+    session = requests_cache.CachedSession(cache_name, expire_after=expire_after)
+    adapter = RateLimitedAdapter(
+        RateLimiter(delay), pool_connections=8, pool_maxsize=8
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_year(session, url, refresh=False):
+    kwargs = {}
+    if refresh and isinstance(session, requests_cache.CacheMixin):
+        # Skip the cached copy and don't store this one: a page fetched while
+        # its year is still running would otherwise be served after it ends.
+        kwargs = {
+            "force_refresh": True,
+            "expire_after": requests_cache.EXPIRE_IMMEDIATELY,
+        }
+    response = session.get(url, timeout=10, **kwargs)
+    if response.status_code != 200:
+        return response.status_code, None
+    return response.status_code, parse_html_data(response.text)
+
+
+def fetch_historical_data(
+    start_year=2009, end_year=2025, max_workers=4, session=None
+):
+    all_draws = []
+    base_url = "https://www.lottodatabase.com/lotto-database/canadian-lotteries/lotto-max/draw-history/"
+    years = range(start_year, end_year + 1)
+    current_year = datetime.now().year
+
+    with ExitStack() as stack:
+        if session is None:
+            session = stack.enter_context(make_session())
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+
+        futures = [
+            executor.submit(
+                fetch_year,
+                session,
+                f"{base_url}{year}",
+                refresh=year >= current_year - 1,
+            )
+            for year in years
+        ]
+
+        for year, future in zip(years, futures):
+            print(f"Results for {year}:")
+
+            try:
+                status_code, year_draws = future.result()
+                if year_draws is not None:
+                    all_draws.append(year_draws)
+                    print(f"  Found {len(year_draws['numbers'])} draws for {year}")
+                else:
+                    print(f"  Failed to fetch data for {year}: HTTP {status_code}")
+            except Exception as e:
+                print(f"  Error fetching data for {year}: {e}")
+
+    return concat_draws(all_draws)
 
 
 def process_pasted_data(html_content):
     draws = parse_html_data(html_content)
-    print(f"Extracted {len(draws)} draws from pasted HTML")
+    print(f"Extracted {len(draws['numbers'])} draws from pasted HTML")
     return draws
 
 
-def analyze_frequency(draws):
-    main_numbers = []
+NUMBERS_TYPE = types.uint8[:, ::1]
 
-    for draw in draws:
-        main_numbers.extend(draw["numbers"])
 
-    main_freq = Counter(main_numbers)
+@njit(
+    types.int64[:, ::1](NUMBERS_TYPE, types.int64[:, ::1], types.int64),
+    cache=True,
+)
+def encode_combos(numbers, index, base):
+    n_draws = numbers.shape[0]
+    n_combos, combination_size = index.shape
+    keys = np.empty((n_draws, n_combos), dtype=np.int64)
 
-    main_df = pd.DataFrame(
-        {"number": list(main_freq.keys()), "frequency": list(main_freq.values())}
-    ).sort_values(by="frequency", ascending=False)
+    for i in range(n_draws):
+        for c in range(n_combos):
+            key = 0
+            for j in range(combination_size):
+                key = key * base + numbers[i, index[c, j]]
+            keys[i, c] = key
 
-    return {"main": main_df}
+    return keys
 
 
-def analyze_combinations(draws, combination_size=2):
-    combinations_count = Counter()
+@njit(
+    types.UniTuple(types.int64[::1], 4)(NUMBERS_TYPE),
+    cache=True,
+)
+def scan_gaps(sorted_numbers):
+    counts = np.zeros(51, dtype=np.int64)
+    gap_sums = np.zeros(51, dtype=np.int64)
+    max_gaps = np.zeros(51, dtype=np.int64)
+    last_seen = np.full(51, -1, dtype=np.int64)
 
-    for draw in draws:
-        numbers = draw["numbers"]
-        for combo in itertools.combinations(sorted(numbers), combination_size):
-            combinations_count[combo] += 1
+    for i in range(sorted_numbers.shape[0]):
+        for j in range(sorted_numbers.shape[1]):
+            num = sorted_numbers[i, j]
+            if last_seen[num] >= 0:
+                gap = i - last_seen[num]
+                gap_sums[num] += gap
+                if gap > max_gaps[num]:
+                    max_gaps[num] = gap
+            counts[num] += 1
+            last_seen[num] = i
 
-    combo_df = pd.DataFrame(
-        {
-            "combination": [str(combo) for combo in combinations_count.keys()],
-            "frequency": list(combinations_count.values()),
-        }
-    ).sort_values(by="frequency", ascending=False)
+    return counts, gap_sums, max_gaps, last_seen
 
-    return combo_df
 
+def rank_counts(counts):
+    # Numbers that were never drawn are left out, as Counter did.
+    (seen,) = np.nonzero(counts)
+    order = seen[np.argsort(-counts[seen], kind="stable")]
 
-def analyze_by_year(draws):
-    draws_by_year = defaultdict(list)
-    for draw in draws:
-        year = draw["year"]
-        draws_by_year[year].append(draw)
+    return order + 1, counts[order]
 
-    yearly_analysis = {}
-    for year, year_draws in draws_by_year.items():
-        yearly_analysis[year] = analyze_frequency(year_draws)["main"]
 
-    return yearly_analysis
+def analyze_frequency(numbers):
+    counts = np.bincount(numbers.ravel(), minlength=51)[1:]
 
+    return rank_counts(counts)
 
-def calculate_additional_stats(draws):
+
+@lru_cache(maxsize=None)
+def combination_index(combination_size, width=7):
+    return np.array(
+        list(itertools.combinations(range(width), combination_size)), dtype=np.int64
+    )
+
+
+def analyze_combinations(numbers, combination_size=2):
+    # Rows are sorted once in make_draws, so every gathered combination is
+    # already in ascending order.
+    keys = encode_combos(numbers, combination_index(combination_size), 51)
+
+    unique_keys, counts = np.unique(keys.ravel(), return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+
+    return unique_keys[order], counts[order]
+
+
+def analyze_by_year(numbers, years):
+    year_ids, year_inv = np.unique(years, return_inverse=True)
+    flat = year_inv[:, None] * 51 + numbers
+    counts = np.bincount(flat.ravel(), minlength=len(year_ids) * 51)
+
+    return year_ids, counts.reshape(len(year_ids), 51)[:, 1:]
+
+
+def calculate_additional_stats(numbers, masks):
     stats = {}
 
-    if not draws:
+    if not len(numbers):
         return stats
 
-    sums = [sum(draw["numbers"]) for draw in draws]
-    stats["average_sum"] = sum(sums) / len(sums)
-    stats["min_sum"] = min(sums)
-    stats["max_sum"] = max(sums)
+    # Rows are sorted, so the range is the last number minus the first.
+    sums = numbers.sum(axis=1, dtype=np.int32)
+    ranges = numbers[:, -1].astype(np.int32) - numbers[:, 0]
+    odd_counts = popcount(masks & ODD_MASK)
+    high_counts = popcount(masks & HIGH_MASK)
+    consecutive_counts = popcount(masks & (masks >> np.uint64(1)))
+    stats["average_sum"] = float(sums.mean())
+    stats["min_sum"] = int(sums.min())
+    stats["max_sum"] = int(sums.max())
 
-    odd_counts = [sum(1 for num in draw["numbers"] if num % 2 == 1) for draw in draws]
-    odd_distribution = Counter(odd_counts)
     stats["odd_even_distribution"] = {
-        f"{odd} odd, {7-odd} even": count
-        for odd, count in sorted(odd_distribution.items())
+        f"{odd} odd, {7-odd} even": int(count)
+        for odd, count in enumerate(np.bincount(odd_counts, minlength=8))
+        if count
     }
-    stats["avg_odd_numbers"] = sum(odd_counts) / len(odd_counts)
+    stats["avg_odd_numbers"] = float(odd_counts.mean())
 
-    high_counts = [sum(1 for num in draw["numbers"] if num > 25) for draw in draws]
-    high_distribution = Counter(high_counts)
     stats["high_low_distribution"] = {
-        f"{high} high, {7-high} low": count
-        for high, count in sorted(high_distribution.items())
+        f"{high} high, {7-high} low": int(count)
+        for high, count in enumerate(np.bincount(high_counts, minlength=8))
+        if count
     }
-    stats["avg_high_numbers"] = sum(high_counts) / len(high_counts)
-
-    consecutive_counts = []
-    for draw in draws:
-        sorted_nums = sorted(draw["numbers"])
-        consecutive = 0
-        for i in range(len(sorted_nums) - 1):
-            if sorted_nums[i + 1] - sorted_nums[i] == 1:
-                consecutive += 1
-        consecutive_counts.append(consecutive)
-
-    consecutive_distribution = Counter(consecutive_counts)
+    stats["avg_high_numbers"] = float(high_counts.mean())
+
     stats["consecutive_pairs_distribution"] = {
-        f"{pairs} consecutive pairs": count
-        for pairs, count in sorted(consecutive_distribution.items())
+        f"{pairs} consecutive pairs": int(count)
+        for pairs, count in enumerate(np.bincount(consecutive_counts, minlength=7))
+        if count
     }
-    stats["avg_consecutive_pairs"] = sum(consecutive_counts) / len(consecutive_counts)
+    stats["avg_consecutive_pairs"] = float(consecutive_counts.mean())
 
-    ranges = [max(draw["numbers"]) - min(draw["numbers"]) for draw in draws]
-    stats["avg_range"] = sum(ranges) / len(ranges)
-    stats["min_range"] = min(ranges)
-    stats["max_range"] = max(ranges)
+    stats["avg_range"] = float(ranges.mean())
+    stats["min_range"] = int(ranges.min())
+    stats["max_range"] = int(ranges.max())
 
     return stats
 
 
-def find_hot_cold_numbers(freq_df, total_draws, period="all time"):
+def find_hot_cold_numbers(nums, counts, total_draws, period="all time", n=10):
+    columns = ["number", "frequency", "expected", "deviation"]
+    if total_draws == 0:
+        return {
+            "period": period,
+            "hot": pd.DataFrame(columns=columns),
+            "cold": pd.DataFrame(columns=columns),
+        }
+
     expected_freq = total_draws * 7 / 50
+    deviation = (counts - expected_freq) / expected_freq * 100
+    n = min(n, len(counts))
+
+    def top(keys):
+        idx = np.argpartition(keys, n - 1)[:n]
+        idx = idx[np.argsort(keys[idx], kind="stable")]
+        return pd.DataFrame(
+            {
+                "number": nums[idx],
+                "frequency": counts[idx],
+                "expected": expected_freq,
+                "deviation": deviation[idx],
+            }
+        )
 
-    freq_df = freq_df.copy()
-    freq_df["expected"] = expected_freq
-    freq_df["deviation"] = (
-        (freq_df["frequency"] - freq_df["expected"]) / freq_df["expected"] * 100
-    )
+    return {"period": period, "hot": top(-deviation), "cold": top(deviation)}
 
-    hot_numbers = freq_df.sort_values(by="deviation", ascending=False).head(10)
-    cold_numbers = freq_df.sort_values(by="deviation", ascending=True).head(10)
 
-    return {"period": period, "hot": hot_numbers, "cold": cold_numbers}
+def find_patterns(numbers, dates):
+    patterns = {}
 
+    order = np.argsort(dates, kind="stable")
+    sorted_numbers = numbers[order]
 
-def find_patterns(draws):
-    patterns = {}
+    counts, gap_sums, max_gaps, last_seen = scan_gaps(sorted_numbers)
 
     number_gaps = {}
     for num in range(1, 51):
-        last_seen = None
-        gaps = []
-
-        for i, draw in enumerate(sorted(draws, key=lambda x: x["date"])):
-            if num in draw["numbers"]:
-                if last_seen is not None:
-                    gaps.append(i - last_seen)
-                last_seen = i
-
-        if gaps:
+        if counts[num] > 1:
             number_gaps[num] = {
-                "avg_gap": sum(gaps) / len(gaps),
-                "max_gap": max(gaps),
-                "current_gap": (
-                    len(draws) - last_seen if last_seen is not None else None
-                ),
+                "avg_gap": float(gap_sums[num] / (counts[num] - 1)),
+                "max_gap": int(max_gaps[num]),
+                "current_gap": int(len(sorted_numbers) - last_seen[num]),
             }
 
     patterns["number_gaps"] = number_gaps
@@ -212,128 +438,110 @@ def find_patterns(draws):
 
 
 def visualize_data(
-    freq_df,
-    combo_df,
-    triplet_df,
-    quad_df,
-    five_df,
-    six_df,
-    seven_df,
+    freq,
+    pairs,
+    triplets,
+    quads,
+    fives,
+    sixes,
+    sevens,
     yearly_analysis,
     stats,
+    max_workers=None,
 ):
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="number", y="frequency", data=freq_df.head(50), color="cornflowerblue"
-    )
-    plt.title("Frequency of Lotto Max Numbers")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig("number_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=combo_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max Number Pairs")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("pairs_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=triplet_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max Triplets")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("triplets_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=quad_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max 4-Number Combinations")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("quads_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=five_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max 5-Number Combinations")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("five_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=six_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max 6-Number Combinations")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("six_frequency.png")
-
-    plt.figure(figsize=(15, 8))
-    sns.barplot(
-        x="combination", y="frequency", data=seven_df.head(20), color="cornflowerblue"
-    )
-    plt.title("Top 20 Most Frequent Lotto Max 7-Number Combinations")
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("seven_frequency.png")
-
-    all_years = sorted(yearly_analysis.keys())
-
-    all_numbers = list(range(1, 51))
-    heatmap_data = pd.DataFrame(index=all_years, columns=all_numbers)
-
-    for year in all_years:
-        year_freq = yearly_analysis[year]
-        year_freq_dict = dict(zip(year_freq["number"], year_freq["frequency"]))
-        for num in all_numbers:
-            heatmap_data.loc[year, num] = year_freq_dict.get(num, 0)
-
-    avg_frequency = heatmap_data.mean()
-    median_frequency = heatmap_data.median()
-    heatmap_data.loc['Average'] = avg_frequency
-    heatmap_data.loc['Median'] = median_frequency
-
-    heatmap_data = heatmap_data.apply(pd.to_numeric)
-
-    plt.figure(figsize=(20, 12))  # Made figure slightly taller
-    sns.heatmap(heatmap_data, cmap="YlGnBu", annot=False)
-    plt.title("Number Frequency by Year")
-    plt.xlabel("Number")
-    plt.ylabel("Year")
-    plt.tight_layout()
-    plt.savefig("yearly_heatmap.png")
+    def head(ranked, n):
+        values, counts = ranked
+        return values[:n], counts[:n]
+
+    tasks = [
+        (plot_frequency, head(freq, 50), "number_frequency.png"),
+        (
+            plot_combinations,
+            head(pairs, 20),
+            "Top 20 Most Frequent Lotto Max Number Pairs",
+            "pairs_frequency.png",
+        ),
+        (
+            plot_combinations,
+            head(triplets, 20),
+            "Top 20 Most Frequent Lotto Max Triplets",
+            "triplets_frequency.png",
+        ),
+        (
+            plot_combinations,
+            head(quads, 20),
+            "Top 20 Most Frequent Lotto Max 4-Number Combinations",
+            "quads_frequency.png",
+        ),
+        (
+            plot_combinations,
+            head(fives, 20),
+            "Top 20 Most Frequent Lotto Max 5-Number Combinations",
+            "five_frequency.png",
+        ),
+        (
+            plot_combinations,
+            head(sixes, 20),
+            "Top 20 Most Frequent Lotto Max 6-Number Combinations",
+            "six_frequency.png",
+        ),
+        (
+            plot_combinations,
+            head(sevens, 20),
+            "Top 20 Most Frequent Lotto Max 7-Number Combinations",
+            "seven_frequency.png",
+        ),
+        (plot_yearly_heatmap, yearly_analysis, "yearly_heatmap.png"),
+    ]
 
     if "odd_even_distribution" in stats:
-        plt.figure(figsize=(10, 6))
-        labels = list(stats["odd_even_distribution"].keys())
-        values = list(stats["odd_even_distribution"].values())
-        plt.bar(labels, values, color="cornflowerblue")
-        plt.title("Distribution of Odd vs Even Numbers")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig("odd_even_distribution.png")
-
-
-def save_to_csv(draws, filename="lotto_max_draws.csv"):
-    data = []
-    for draw in draws:
-        row = {"date": draw["date"], "year": draw["year"]}
+        tasks.append(
+            (plot_odd_even, stats["odd_even_distribution"], "odd_even_distribution.png")
+        )
 
-        for i, num in enumerate(draw["numbers"]):
-            row[f"number_{i+1}"] = num
+    # Forked workers start with everything already imported. Under spawn or
+    # forkserver each worker would re-import app.py, Numba kernels and all,
+    # which costs more than the plotting it saves, so plot in-process there.
+    if hasattr(os, "sched_getaffinity"):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 1
+    max_workers = min(len(tasks), max_workers or cpu_count)
+    if max_workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        for plot, *args in tasks:
+            plot(*args)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=init_plot_worker,
+    ) as executor:
+        futures = [executor.submit(*task) for task in tasks]
+        for future in futures:
+            future.result()
+
+
+def save_to_csv(
+    numbers, years, dates, filename="lotto_max_draws.csv", chunk_size=10000
+):
+    with open(filename, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(
+            ["date", "year", *(f"number_{i+1}" for i in range(numbers.shape[1]))]
+        )
 
-        data.append(row)
+        for start in range(0, len(numbers), chunk_size):
+            stop = start + chunk_size
+            writer.writerows(
+                [date, year, *draw]
+                for date, year, draw in zip(
+                    np.datetime_as_string(dates[start:stop]),
+                    years[start:stop].tolist(),
+                    numbers[start:stop].tolist(),
+                )
+            )
 
-    df = pd.DataFrame(data)
-    df.to_csv(filename, index=False)
     print(f"Data saved to {filename}")
 
 
@@ -341,54 +549,58 @@ def main():
 
     print("Fetching historical data from 2019 to 2025...")
     all_draws = fetch_historical_data(2019, 2025)
+    numbers = all_draws["numbers"]
+    years = all_draws["years"]
+    dates = all_draws["dates"]
+    masks = all_draws["masks"]
 
-    print(f"\nTotal draws collected: {len(all_draws)}")
+    print(f"\nTotal draws collected: {len(numbers)}")
 
     print("\nAnalyzing number frequencies...")
-    freq_results = analyze_frequency(all_draws)
-    main_freq_df = freq_results["main"]
+    main_freq = analyze_frequency(numbers)
 
     print("Top 10 most frequent main numbers:")
-    print(main_freq_df.head(10))
+    print(frequency_table(*main_freq, 10))
 
     print("\nAnalyzing number pairs...")
-    combo_df = analyze_combinations(all_draws, 2)
+    pairs = analyze_combinations(numbers, 2)
     print("Top 10 most frequent pairs:")
-    print(combo_df.head(10))
+    print(combination_table(*pairs, 10))
 
     print("\nAnalyzing combinations of 3 numbers...")
-    triplet_df = analyze_combinations(all_draws, 3)
+    triplets = analyze_combinations(numbers, 3)
     print("Top 10 most frequent triplets:")
-    print(triplet_df.head(10))
+    print(combination_table(*triplets, 10))
 
     print("\nAnalyzing combinations of 4 numbers...")
-    quad_df = analyze_combinations(all_draws, 4)
+    quads = analyze_combinations(numbers, 4)
     print("Top 10 most frequent 4-number combinations:")
-    print(quad_df.head(10))
+    print(combination_table(*quads, 10))
 
     print("\nAnalyzing combinations of 5 numbers...")
-    five_df = analyze_combinations(all_draws, 5)
+    fives = analyze_combinations(numbers, 5)
     print("Top 10 most frequent 5-number combinations:")
-    print(five_df.head(10))
+    print(combination_table(*fives, 10))
 
     print("\nAnalyzing combinations of 6 numbers...")
-    six_df = analyze_combinations(all_draws, 6)
+    sixes = analyze_combinations(numbers, 6)
     print("Top 10 most frequent 6-number combinations:")
-    print(six_df.head(10))
+    print(combination_table(*sixes, 10))
 
     print("\nAnalyzing combinations of 7 numbers...")
-    seven_df = analyze_combinations(all_draws, 7)
+    sevens = analyze_combinations(numbers, 7)
     print("Top 10 most frequent 7-number combinations:")
-    print(seven_df.head(10))
+    print(combination_table(*sevens, 10))
 
     print("\nAnalyzing by year...")
-    yearly_analysis = analyze_by_year(all_draws)
-    for year in sorted(yearly_analysis.keys())[-3:]:
+    yearly_analysis = analyze_by_year(numbers, years)
+    year_ids, year_counts = yearly_analysis
+    for year, counts in zip(year_ids[-3:], year_counts[-3:]):
         print(f"\nTop 10 numbers for {year}:")
-        print(yearly_analysis[year].head(10))
+        print(frequency_table(*rank_counts(counts), 10))
 
     print("\nCalculating additional statistics...")
-    stats = calculate_additional_stats(all_draws)
+    stats = calculate_additional_stats(numbers, masks)
     for stat, value in stats.items():
         if isinstance(value, dict):
             print(f"\n{stat}:")
@@ -398,34 +610,34 @@ def main():
             print(f"{stat}: {value}")
 
     print("\nFinding hot and cold numbers...")
-    hot_cold = find_hot_cold_numbers(main_freq_df, len(all_draws))
+    hot_cold = find_hot_cold_numbers(*main_freq, len(numbers))
     print("\nHot numbers (most frequent compared to expected):")
     print(hot_cold["hot"][["number", "frequency", "deviation"]].to_string(index=False))
     print("\nCold numbers (least frequent compared to expected):")
     print(hot_cold["cold"][["number", "frequency", "deviation"]].to_string(index=False))
 
     print("\nFinding patterns in draw history...")
-    patterns = find_patterns(all_draws)
+    patterns = find_patterns(numbers, dates)
     print("\nNumber gap analysis:")
-    for num, gap_data in list(patterns["number_gaps"].items()):
+    for num, gap_data in patterns["number_gaps"].items():
         print(
             f"  [{num}]: Avg gap {gap_data['avg_gap']:.1f} draws, Current gap {gap_data['current_gap']}"
         )
 
     print("\nCreating visualizations...")
     visualize_data(
-        main_freq_df,
-        combo_df,
-        triplet_df,
-        quad_df,
-        five_df,
-        six_df,
-        seven_df,
+        main_freq,
+        pairs,
+        triplets,
+        quads,
+        fives,
+        sixes,
+        sevens,
         yearly_analysis,
         stats,
     )
 
-    save_to_csv(all_draws)
+    save_to_csv(numbers, years, dates)
 
     print("\nAnalysis complete!")
 
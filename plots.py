@@ -0,0 +1,96 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+# Plotting helpers, kept free of the scraping and Numba dependencies in app.py.
+
+
+def decode_combination(key):
+    # Numbers are 1-50, so no base-51 digit is ever zero and the key alone
+    # tells how many numbers it holds.
+    combo = []
+    while key:
+        key, num = divmod(key, 51)
+        combo.append(num)
+    return tuple(reversed(combo))
+
+
+def frequency_table(nums, counts, n=None):
+    return pd.DataFrame({"number": nums[:n], "frequency": counts[:n]})
+
+
+def combination_table(keys, counts, n=None):
+    return pd.DataFrame(
+        {
+            "combination": [str(decode_combination(key)) for key in keys[:n].tolist()],
+            "frequency": counts[:n],
+        }
+    )
+
+
+def init_plot_worker():
+    matplotlib.use("Agg")
+
+
+def plot_frequency(freq, path):
+    plt.figure(figsize=(15, 8))
+    sns.barplot(
+        x="number",
+        y="frequency",
+        data=frequency_table(*freq, 50),
+        color="cornflowerblue",
+    )
+    plt.title("Frequency of Lotto Max Numbers")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def plot_combinations(combinations, title, path):
+    plt.figure(figsize=(15, 8))
+    sns.barplot(
+        x="combination",
+        y="frequency",
+        data=combination_table(*combinations, 20),
+        color="cornflowerblue",
+    )
+    plt.title(title)
+    plt.xticks(rotation=90)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def plot_yearly_heatmap(yearly_analysis, path):
+    year_ids, year_counts = yearly_analysis
+
+    heatmap_data = pd.DataFrame(
+        np.vstack(
+            [year_counts, year_counts.mean(axis=0), np.median(year_counts, axis=0)]
+        ),
+        index=[*year_ids.tolist(), "Average", "Median"],
+        columns=np.arange(1, 51),
+    )
+
+    plt.figure(figsize=(20, 12))  # Made figure slightly taller
+    sns.heatmap(heatmap_data, cmap="YlGnBu", annot=False)
+    plt.title("Number Frequency by Year")
+    plt.xlabel("Number")
+    plt.ylabel("Year")
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def plot_odd_even(odd_even_distribution, path):
+    plt.figure(figsize=(10, 6))
+    labels, values = zip(*odd_even_distribution.items())
+    plt.bar(labels, values, color="cornflowerblue")
+    plt.title("Distribution of Odd vs Even Numbers")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()